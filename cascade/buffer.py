@@ -5,36 +5,45 @@
 消除性能瓶颈，保持接口兼容性。
 
 核心优化：
-- 使用bytes而不是bytearray，减少动态分配开销
+- 使用预分配的int16样本数组存储数据，避免逐次写入的bytes拼接
+- 读取帧时可直接融合int16->float32转换，写入调用方预分配的数组
 - 简化缓冲区管理，避免复杂的溢出处理
-- 最小化内存拷贝操作
 - 保持完全的接口兼容性
 """
 
 import logging
 
+import numpy as np
+
+from .errors import BufferError, ErrorCode, ErrorSeverity
+
 logger = logging.getLogger(__name__)
 
+# int16 -> float32 归一化系数
+_I16_TO_F32 = np.float32(1.0 / 32768.0)
+
 
 class FrameAlignedBuffer:
     """
     简化的512样本帧对齐缓冲区 - 性能优化版本
-    
+
     优化原则：
-    - 使用bytes替代bytearray，减少内存分配开销
+    - 使用预分配的int16数组 + 读写指针，写入和读取均无需重新分配
     - 简化溢出处理，避免复杂的LRU机制
-    - 最小化拷贝操作，提升处理效率
+    - 读取时融合类型转换，每帧只遍历一次数据
     - 保持接口完全兼容，零修改迁移
     """
 
     def __init__(self, max_buffer_samples: int = 4000):
         """
         初始化简化帧对齐缓冲区
-        
+
         Args:
             max_buffer_samples: 最大缓冲样本数，默认为4000（0.25秒@16kHz）
         """
-        self._data = b''  # 使用bytes而不是bytearray，性能更优
+        self._samples = np.zeros(max_buffer_samples, dtype=np.int16)
+        self._head = 0  # 下一个待读取样本的位置
+        self._tail = 0  # 下一个待写入样本的位置
         self._frame_size_bytes = 1024  # 512样本 * 2字节
         self._max_buffer_size = max_buffer_samples * 2  # 简化的大小限制
         self._samples_per_frame = 512
@@ -44,105 +53,145 @@ class FrameAlignedBuffer:
     def write(self, audio_data: bytes) -> None:
         """
         写入音频数据到缓冲区 - 优化版本
-        
+
         Args:
-            audio_data: 音频数据（任意大小）
-        
+            audio_data: 16-bit PCM音频数据（任意样本数）
+
         Raises:
-            BufferError: 缓冲区溢出时抛出异常
+            BufferError: 数据不是16-bit对齐时抛出异常
         """
         if not audio_data:
             return
 
+        if len(audio_data) % 2 != 0:
+            raise BufferError(
+                f"音频数据必须16-bit对齐，当前: {len(audio_data)} bytes",
+                ErrorCode.INVALID_INPUT,
+                ErrorSeverity.HIGH
+            )
+
+        incoming = np.frombuffer(audio_data, dtype=np.int16)
+        count = len(incoming)
+
         # 检查写入后是否会溢出
-        new_size = len(self._data) + len(audio_data)
-        if new_size > self._max_buffer_size:
-            # 记录错误并抛出异常，而不是静默截断
+        new_size = self._tail - self._head + count
+        if new_size * 2 > self._max_buffer_size:
+            # 记录错误并清空，而不是静默截断
             logger.error(
-                f"缓冲区即将溢出: 当前={len(self._data)}B, "
+                f"缓冲区即将溢出: 当前={self.buffer_size_bytes}B, "
                 f"写入={len(audio_data)}B, "
-                f"总计={new_size}B, "
+                f"总计={new_size * 2}B, "
                 f"最大={self._max_buffer_size}B"
             )
             # 紧急情况：清空缓冲区以避免数据损坏
-            self._data = b''
+            self._head = 0
+            self._tail = 0
             logger.warning("已清空缓冲区以防止数据损坏")
-            # 继续写入新数据
-            self._data = audio_data
-            return
-
-        # 使用bytes连接，比bytearray.extend()更高效
-        self._data += audio_data
+            # 单次写入超过容量时扩容，保证新数据完整保留
+            if count > len(self._samples):
+                self._samples = np.empty(count, dtype=np.int16)
+        elif self._tail + count > len(self._samples):
+            # 尾部空间不足：把未读数据搬到数组开头
+            remaining = self._tail - self._head
+            self._samples[:remaining] = self._samples[self._head:self._tail]
+            self._head = 0
+            self._tail = remaining
+
+        self._samples[self._tail:self._tail + count] = incoming
+        self._tail += count
 
     def has_complete_frame(self) -> bool:
         """
         检查是否有完整的512样本帧
-        
+
         Returns:
             True如果有完整帧可读，False否则
         """
-        return len(self._data) >= self._frame_size_bytes
+        return self._tail - self._head >= self._samples_per_frame
 
     def read_frame(self) -> bytes | None:
         """
         读取一个完整的512样本帧 - 优化版本
-        
+
         Returns:
             512样本的音频数据（1024字节），如果不足则返回None
         """
         if not self.has_complete_frame():
             return None
 
-        # 直接切片提取帧数据，避免额外的bytes()转换
-        frame_data = self._data[:self._frame_size_bytes]
-        
-        # 更新缓冲区：移除已读取的数据
-        self._data = self._data[self._frame_size_bytes:]
+        start = self._head
+        self._head += self._samples_per_frame
+        return self._samples[start:self._head].tobytes()
 
-        return frame_data
+    def read_frame_into(self, out: np.ndarray) -> bytes | None:
+        """
+        读取一个完整帧，并将其归一化为float32写入预分配数组
+
+        int16->float32转换与缩放在一次遍历中完成，不产生中间数组。
+
+        Args:
+            out: 调用方预分配的float32数组（长度512）
+
+        Returns:
+            该帧的原始音频数据（1024字节），如果不足则返回None
+        """
+        if not self.has_complete_frame():
+            return None
+
+        start = self._head
+        self._head += self._samples_per_frame
+        frame = self._samples[start:self._head]
+        np.multiply(frame, _I16_TO_F32, out=out, casting='unsafe')
+        return frame.tobytes()
 
     def available_samples(self) -> int:
         """
         返回缓冲区中可用的样本数
-        
+
         Returns:
             可用样本数
         """
-        return len(self._data) // 2  # 2字节/样本
+        return self._tail - self._head
 
     def available_frames(self) -> int:
         """
         返回缓冲区中可用的完整帧数
-        
+
         Returns:
             可用的完整帧数
         """
-        return len(self._data) // self._frame_size_bytes
+        return (self._tail - self._head) // self._samples_per_frame
 
     def clear(self) -> None:
         """清空缓冲区"""
-        self._data = b''
+        self._head = 0
+        self._tail = 0
         logger.debug("FrameAlignedBuffer已清空")
 
     def get_buffer_usage_ratio(self) -> float:
         """
         获取缓冲区使用率
-        
+
         Returns:
             使用率 (0.0-1.0)
         """
-        return len(self._data) / self._max_buffer_size
+        return self.buffer_size_bytes / self._max_buffer_size
 
     @property
     def buffer_size_bytes(self) -> int:
         """当前缓冲区大小（字节）"""
-        return len(self._data)
+        return (self._tail - self._head) * 2
 
     @property
     def max_buffer_size_bytes(self) -> int:
         """最大缓冲区大小（字节）"""
         return self._max_buffer_size
 
+    @property
+    def allocated_bytes(self) -> int:
+        """已分配的样本数组大小（字节）"""
+        return self._samples.nbytes
+
     @property
     def frame_size_bytes(self) -> int:
         """帧大小（字节）"""
@@ -154,7 +203,7 @@ class FrameAlignedBuffer:
         return self._samples_per_frame
 
     def __str__(self) -> str:
-        return (f"FrameAlignedBuffer(size={len(self._data)}B, "
+        return (f"FrameAlignedBuffer(size={self.buffer_size_bytes}B, "
                 f"frames={self.available_frames()}, "
                 f"usage={self.get_buffer_usage_ratio():.1%})")
 
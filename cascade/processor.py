@@ -1,21 +1,23 @@
 """
 流式处理器核心模块 - 简化版
 
-实现1:1:1:1架构：1个StreamProcessor = 1个独立VAD模型 + VADIterator + Buffer + 状态机
-完全独立的实例设计，无锁无竞争，真正的简洁高效。
+实现1:1:1:1架构：1个StreamProcessor = 1个独立VAD流状态 + VADIterator + Buffer + 状态机
+VAD模型权重（ONNX会话）全局共享且只读，流状态完全独立，真正的简洁高效。
 """
 import asyncio
 import logging
 import os
+import threading
 import time
-from collections.abc import AsyncIterator
+from collections import deque
+from collections.abc import AsyncIterator, Callable
 from enum import Enum
 from typing import Optional, TYPE_CHECKING
 
 import numpy as np
 import torch
 
-from .buffer import FrameAlignedBuffer
+from .buffer import _I16_TO_F32, FrameAlignedBuffer
 from .errors import (
     CascadeError,
     ErrorCode,
@@ -36,10 +38,16 @@ if TYPE_CHECKING:
     pass
 
 from .interruption import InterruptionManager
+from .vad_model import SileroOnnxVADIterator, get_shared_onnx_session
 
 # 安全配置常量
 MAX_CHUNK_SIZE = 512 * 1024  # 512KB - 防止意外的超大数据
 MIN_CHUNK_SIZE = 2  # 最小2字节（1个样本）
+MAX_INFLIGHT_CHUNKS = 50  # 最多50个并发处理的音频块
+
+# 静音跳过配置（Config.skip_silent_frames开启时生效）
+SILENCE_PEAK_THRESHOLD = 32 / 32768.0  # 帧峰值低于此值视为静音（约-60dBFS）
+SILENCE_REFRESH_INTERVAL = 50  # 连续跳过的静音帧达到此数量后执行一次真实推理
 
 logger = logging.getLogger(__name__)
 
@@ -56,6 +64,8 @@ class SpeechCollector:
     
     负责收集从VAD检测到start到end之间的所有音频帧，
     并在检测到end时生成完整的语音段。
+    
+    只保留连续的音频数据和少量计数信息，不持有帧对象。
     """
 
     def __init__(self, segment_id: int):
@@ -66,7 +76,9 @@ class SpeechCollector:
             segment_id: 语音段ID
         """
         self.segment_id = segment_id
-        self.frames: list[AudioFrame] = []
+        self._audio = bytearray()  # 已收集帧的音频数据，按帧顺序连续存放
+        self._frame_count = 0
+        self._last_timestamp_ms: float | None = None
         self.start_timestamp_ms: float | None = None
         self.start_vad_result: dict | None = None
         self.is_collecting = False
@@ -84,7 +96,9 @@ class SpeechCollector:
             logger.warning(f"SpeechCollector {self.segment_id} 已在收集中，忽略新的start")
             return
 
-        self.frames = [start_frame]
+        self._audio = bytearray(start_frame.audio_data)
+        self._frame_count = 1
+        self._last_timestamp_ms = start_frame.timestamp_ms
         self.start_timestamp_ms = start_frame.timestamp_ms
         self.start_vad_result = start_frame.vad_result
         self.is_collecting = True
@@ -102,7 +116,7 @@ class SpeechCollector:
             logger.warning(f"SpeechCollector {self.segment_id} 未在收集状态，忽略帧")
             return
 
-        self.frames.append(frame)
+        self._append_frame(frame)
         logger.debug(f"SpeechCollector {self.segment_id} 添加帧 {frame.frame_id}")
 
     def end_collection(self, end_frame: AudioFrame) -> SpeechSegment:
@@ -125,18 +139,15 @@ class SpeechCollector:
             raise ValueError("结束帧缺少VAD结果")
 
         # 添加结束帧
-        self.frames.append(end_frame)
-
-        # 合并所有音频数据
-        audio_data = b''.join(frame.audio_data for frame in self.frames)
+        self._append_frame(end_frame)
 
-        # 创建语音段
+        # 创建语音段（音频数据只拷贝一次）
         segment = SpeechSegment(
             segment_id=self.segment_id,
-            audio_data=audio_data,
+            audio_data=bytes(self._audio),
             start_timestamp_ms=self.start_timestamp_ms,
             end_timestamp_ms=end_frame.timestamp_ms,
-            frame_count=len(self.frames),
+            frame_count=self._frame_count,
             start_vad_result=self.start_vad_result,
             end_vad_result=end_frame.vad_result
         )
@@ -149,28 +160,36 @@ class SpeechCollector:
 
     def reset(self) -> None:
         """重置收集器状态"""
-        self.frames.clear()
+        self._audio = bytearray()
+        self._frame_count = 0
+        self._last_timestamp_ms = None
         self.start_timestamp_ms = None
         self.start_vad_result = None
         self.is_collecting = False
         logger.debug(f"SpeechCollector {self.segment_id} 重置")
 
+    def _append_frame(self, frame: AudioFrame) -> None:
+        """追加一帧的音频数据和计数信息"""
+        self._audio.extend(frame.audio_data)
+        self._frame_count += 1
+        self._last_timestamp_ms = frame.timestamp_ms
+
     @property
     def frame_count(self) -> int:
         """当前收集的帧数"""
-        return len(self.frames)
+        return self._frame_count
 
     @property
     def duration_ms(self) -> float:
         """当前收集的时长(ms)"""
-        if not self.frames or self.start_timestamp_ms is None:
+        if self._last_timestamp_ms is None or self.start_timestamp_ms is None:
             return 0.0
-        return self.frames[-1].timestamp_ms - self.start_timestamp_ms
+        return self._last_timestamp_ms - self.start_timestamp_ms
 
     @property
     def memory_usage_bytes(self) -> int:
         """当前内存使用量(字节)"""
-        return sum(len(frame.audio_data) for frame in self.frames)
+        return len(self._audio)
 
     def __str__(self) -> str:
         status = "collecting" if self.is_collecting else "idle"
@@ -213,16 +232,14 @@ class VADStateMachine:
         Returns:
             处理结果，可能是单帧或语音段
         """
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
 
         try:
             result = self._handle_vad_result(frame)
 
-            # 计算处理时间
-            processing_time_ms = (time.time() - start_time) * 1000
-
             if result:
-                result.processing_time_ms = processing_time_ms
+                # 计算处理时间
+                result.processing_time_ms = (time.perf_counter_ns() - start_ns) / 1e6
                 result.instance_id = self.instance_id
 
             return result
@@ -411,21 +428,22 @@ class StreamProcessor:
     """
     流式处理器 - 简化的1:1:1:1架构
     
-    每个实例对应一个WebSocket连接，拥有完全独立的VAD模型和组件。
-    无锁无竞争设计，真正的简洁高效。
+    每个实例对应一个WebSocket连接，拥有完全独立的VAD流状态和组件。
+    同一实例的音频块由_chunk_lock（asyncio.Lock）按提交顺序逐块串行处理，
+    外部设置系统状态与工作线程中的状态机通过_state_lock（threading.Lock）互斥；
+    不同实例之间没有共享的可变状态，互不等待。
     
     核心组件：
-    - 独立的VAD模型实例
+    - 独立的VAD流状态（共享只读的模型权重）
     - 独立的VADIterator实例
     - FrameAlignedBuffer（同步，快速）
     - VADStateMachine（同步，快速）
     
     处理流程：
     1. 音频数据写入FrameAlignedBuffer（同步）
-    2. 读取完整512样本帧（同步）
-    3. VAD推理（使用asyncio.to_thread在线程池中执行）
-    4. 状态机处理（同步）
-    5. 返回结果
+    2. 读取完整512样本帧、VAD推理、状态机处理
+       （整块通过一次asyncio.to_thread在线程池中执行）
+    3. 返回结果
     """
 
     def __init__(self, config: Optional[Config] = None):
@@ -452,24 +470,39 @@ class StreamProcessor:
         self.frame_buffer = FrameAlignedBuffer(max_buffer_samples=128000)
         self.state_machine = VADStateMachine("stream_processor", self.interruption_manager)
         
+        # 状态机在工作线程中运行，外部设置系统状态时需要互斥
+        self._state_lock = threading.Lock()
+        
         # VAD组件（延迟初始化）
         self.model = None
         self.vad_iterator = None
+        self._model_device: torch.device | None = None  # PyTorch模型所在设备，初始化时确定
+        
+        # 预分配的帧批量转换缓冲区（按需扩容，每块复用，避免逐帧分配）
+        # 由torch张量持有内存，numpy视图与其共享，两种推理路径都无需再包装
+        self._f32_tensor = torch.empty((1, AUDIO_FRAME_SIZE), dtype=torch.float32)
+        self._f32_buf = self._f32_tensor.numpy()
+        
+        # 连续跳过VAD推理的静音帧数
+        self._skipped_silent_frames = 0
         
         # 统计信息
         self.frame_counter = 0
         self.total_chunks_processed = 0
-        self.total_processing_time_ms = 0.0
+        self.total_processing_time_ns = 0  # 整数纳秒累计，导出统计时再换算为毫秒
         self.speech_segments_count = 0
         self.single_frames_count = 0
         self.error_count = 0
         
         # 性能监控
-        self.processing_times = []  # 最近100次处理时间
         self.max_processing_times = 100
+        self.processing_times = deque(maxlen=self.max_processing_times)  # 最近100次处理时间
         
         # 并发控制
-        self._processing_semaphore = asyncio.Semaphore(50)  # 最多50个并发处理
+        self._inflight_chunks = 0  # 正在处理的音频块数（事件循环单线程访问，无需加锁）
+        # 同一流的音频块按提交顺序逐个处理（asyncio.Lock按FIFO唤醒等待者），
+        # 调用方可以并发提交多个块而不会打乱帧顺序或并发访问VAD状态
+        self._chunk_lock = asyncio.Lock()
         self._last_process_time = 0.0  # 上次处理时间
         self._min_process_interval = 0.0  # 不限制调用间隔
         
@@ -490,33 +523,46 @@ class StreamProcessor:
         """
         异步初始化VAD组件
         
-        关键：每个实例加载自己的独立模型，避免并发问题
+        关键：每个实例拥有独立的VAD流状态，避免并发问题
         """
         if self.is_initialized:
             logger.warning("StreamProcessor已经初始化")
             return
         
         try:
-            # 加载独立的VAD模型（在线程池中执行）
-            from silero_vad import load_silero_vad, VADIterator
-            
-            logger.info("开始加载独立VAD模型...")
-            self.model = await asyncio.to_thread(
-                load_silero_vad,
-                onnx=False  # 使用PyTorch模式
-            )
-            
-            # 创建独立的VADIterator实例
-            self.vad_iterator = VADIterator(
-                self.model,  # 使用独立模型
-                sampling_rate=16000,
-                threshold=self.config.vad_threshold,
-                min_silence_duration_ms=self.config.min_silence_duration_ms,
-                speech_pad_ms=self.config.speech_pad_ms
-            )
+            logger.info("开始加载VAD模型...")
+            if self.config.use_onnx:
+                # 所有处理器共享同一个ONNX会话（单线程会话，首次调用时在线程池中加载），
+                # 每个处理器只持有独立的VAD迭代器状态，直接以numpy帧推理
+                self.model = await asyncio.to_thread(get_shared_onnx_session)
+                self.vad_iterator = SileroOnnxVADIterator(
+                    self.model,
+                    sampling_rate=16000,
+                    threshold=self.config.vad_threshold,
+                    min_silence_duration_ms=self.config.min_silence_duration_ms,
+                    speech_pad_ms=self.config.speech_pad_ms
+                )
+            else:
+                from silero_vad import load_silero_vad, VADIterator
+                
+                # TorchScript模型内部持有流状态，无法共享，每个处理器加载独立模型
+                self.model = await asyncio.to_thread(
+                    load_silero_vad,
+                    onnx=False
+                )
+                first_param = next(self.model.parameters(), None)
+                if first_param is not None:
+                    self._model_device = first_param.device
+                self.vad_iterator = VADIterator(
+                    self.model,
+                    sampling_rate=16000,
+                    threshold=self.config.vad_threshold,
+                    min_silence_duration_ms=self.config.min_silence_duration_ms,
+                    speech_pad_ms=self.config.speech_pad_ms
+                )
             
             self.is_initialized = True
-            logger.info("StreamProcessor初始化完成（独立模型已加载）")
+            logger.info("StreamProcessor初始化完成（VAD模型已加载）")
             
         except Exception as e:
             logger.error(f"StreamProcessor初始化失败: {e}")
@@ -526,17 +572,23 @@ class StreamProcessor:
                 ErrorSeverity.HIGH
             ) from e
     
-    async def process_chunk(self, audio_data: bytes) -> list[CascadeResult]:
+    async def process_chunk(self, audio_data: bytes | memoryview) -> list[CascadeResult]:
         """
         处理音频块
         
-        带有并发控制和速率限制，防止资源耗尽。
+        带有并发控制，防止资源耗尽：同时处理的块数达到上限时立即拒绝，
+        而不是排队等待（实时音频中排队后的过期数据比丢弃更糟）。
+        未超过上限的并发调用按提交顺序串行处理，可以流水线方式提交。
         
         Args:
-            audio_data: 音频数据（任意大小）
+            audio_data: 音频数据（任意大小），可以是bytes或连续内存的memoryview，
+                后者允许调用方零拷贝地切片大段音频
             
         Returns:
             处理结果列表
+            
+        Raises:
+            CascadeError: 未初始化、数据非法或并发处理数超过上限
         """
         if self.vad_iterator is None:
             raise CascadeError(
@@ -545,17 +597,105 @@ class StreamProcessor:
                 ErrorSeverity.HIGH
             )
         
+        # 按字节处理memoryview（len()等同于字节数）
+        if isinstance(audio_data, memoryview):
+            if not audio_data.c_contiguous:
+                raise CascadeError(
+                    "音频数据格式错误: memoryview必须是C连续内存",
+                    ErrorCode.INVALID_INPUT,
+                    ErrorSeverity.HIGH,
+                    {"shape": audio_data.shape, "strides": audio_data.strides}
+                )
+            audio_data = audio_data.cast('B')
+        
         # 安全验证：输入数据大小和格式
         self._validate_audio_chunk(audio_data)
         
         # 并发控制：限制同时处理的数量（防止资源耗尽）
-        async with self._processing_semaphore:
-            results = await self._process_chunk_internal(audio_data)
+        if self._inflight_chunks >= MAX_INFLIGHT_CHUNKS:
+            raise CascadeError(
+                f"并发处理的音频块过多: {self._inflight_chunks}",
+                ErrorCode.RESOURCE_EXHAUSTED,
+                ErrorSeverity.MEDIUM,
+                {"inflight_chunks": self._inflight_chunks, "max_inflight": MAX_INFLIGHT_CHUNKS}
+            )
+        
+        self._inflight_chunks += 1
+        try:
+            async with self._chunk_lock:
+                results = await self._process_chunk_internal(audio_data)
+        finally:
+            self._inflight_chunks -= 1
         
         self._last_process_time = time.time()
         return results
     
-    async def _process_chunk_internal(self, audio_data: bytes) -> list[CascadeResult]:
+    async def process_float(self, audio: np.ndarray) -> list[CascadeResult]:
+        """
+        处理float32音频块
+        
+        样本取值范围为[-1.0, 1.0]，超出部分截断。音频先量化为int16 PCM再按
+        process_chunk处理：语音段结果需要PCM数据，且VAD判定与字节输入完全一致。
+        调用方无需预先把整段音频转换为字节，可以直接传入大数组的切片。
+        
+        Args:
+            audio: 一维float32音频数组（16kHz单声道，任意长度）
+            
+        Returns:
+            处理结果列表
+            
+        Raises:
+            CascadeError: 未初始化、数据非法或并发处理数超过上限
+        """
+        if audio.ndim != 1:
+            raise CascadeError(
+                f"音频数组必须是一维单声道数据，当前形状: {audio.shape}",
+                ErrorCode.INVALID_INPUT,
+                ErrorSeverity.HIGH,
+                {"shape": audio.shape}
+            )
+        
+        # 缩放、截断、取整后直接写入int16数组
+        scaled = np.multiply(audio, 32767.0, dtype=np.float32)
+        np.clip(scaled, -32768.0, 32767.0, out=scaled)
+        pcm = np.empty(len(audio), dtype=np.int16)
+        np.rint(scaled, out=pcm, casting='unsafe')
+        
+        return await self.process_chunk(memoryview(pcm))
+    
+    async def _run_in_worker(
+        self,
+        func: Callable[..., list[CascadeResult]],
+        *args: object
+    ) -> list[CascadeResult]:
+        """
+        在线程池中执行同步处理函数，调用方被取消时仍等到工作线程结束
+        
+        工作线程无法被中断。如果取消后立即释放_chunk_lock，下一个块会在另一个
+        线程中与仍在运行的处理同时访问VAD迭代器、缓冲区和状态机。
+        
+        Args:
+            func: 同步处理函数
+            *args: 传给func的参数
+            
+        Returns:
+            func的返回值
+        """
+        future = asyncio.ensure_future(asyncio.to_thread(func, *args))
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            # 等待期间再次被取消也继续等待，线程结束后再传播取消
+            while not future.done():
+                try:
+                    await asyncio.wait((future,))
+                except asyncio.CancelledError:
+                    pass
+            if not future.cancelled():
+                future.exception()  # 取出结果，避免"exception was never retrieved"
+            raise
+    
+    async def _process_chunk_internal(self, audio_data: bytes | memoryview) -> list[CascadeResult]:
         """
         内部处理逻辑（在并发控制下执行）
         
@@ -566,63 +706,34 @@ class StreamProcessor:
             处理结果列表
         """
         results = []
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         
         try:
-            # 1. 写入缓冲区（同步，快速）
-            self.frame_buffer.write(audio_data)
-            
-            # 2. 处理所有完整帧
-            while self.frame_buffer.has_complete_frame():
-                # 读取帧（同步，快速）
-                frame_data = self.frame_buffer.read_frame()
-                
-                if not frame_data:
-                    break
-                
-                # 准备数据（同步，快速）
-                audio_array = np.frombuffer(
-                    frame_data,
-                    dtype=np.int16
-                ).astype(np.float32) / 32768.0
-                
-                audio_tensor = torch.from_numpy(audio_array)
-                
-                # VAD推理（异步，CPU密集型，在线程池中执行）
-                # 由于每个StreamProcessor有独立的model和vad_iterator，
-                # 多个StreamProcessor可以并发调用，互不干扰
-                vad_result = await asyncio.to_thread(
-                    self.vad_iterator,
-                    audio_tensor
+            # 由于每个StreamProcessor有独立的流状态和vad_iterator，
+            # 多个StreamProcessor可以并发调用，互不干扰；
+            # 同一StreamProcessor内由_chunk_lock保证串行
+            if (
+                len(audio_data) == self.frame_buffer.frame_size_bytes
+                and not self.frame_buffer.available_samples()
+            ):
+                # 快速路径：缓冲区为空且正好一帧，无需经过缓冲区
+                results = await self._run_in_worker(
+                    self._process_single_frame_sync,
+                    audio_data
                 )
+            else:
+                # 1. 写入缓冲区（同步，快速）
+                self.frame_buffer.write(audio_data)
                 
-                # 状态机处理（同步，快速逻辑）
-                self.frame_counter += 1
-                timestamp_ms = self.frame_counter * 32.0  # 32ms per frame
-                
-                frame = AudioFrame(
-                    frame_id=self.frame_counter,
-                    audio_data=frame_data,
-                    timestamp_ms=timestamp_ms,
-                    vad_result=vad_result
-                )
-                
-                result = self.state_machine.process_frame(frame)
-                
-                if result:
-                    # 更新统计
-                    if result.is_speech_segment:
-                        self.speech_segments_count += 1
-                    else:
-                        self.single_frames_count += 1
-                    
-                    results.append(result)
+                # 2. 读帧、VAD推理、状态机处理（CPU密集型，整块在线程池中一次完成）
+                if self.frame_buffer.has_complete_frame():
+                    results = await self._run_in_worker(self._drain_frames_sync)
             
             # 记录处理时间
-            processing_time = (time.time() - start_time) * 1000
+            processing_time_ns = time.perf_counter_ns() - start_ns
             self.total_chunks_processed += 1
-            self.total_processing_time_ms += processing_time
-            self._record_processing_time(processing_time)
+            self.total_processing_time_ns += processing_time_ns
+            self._record_processing_time(processing_time_ns / 1e6)
             
             return results
             
@@ -635,6 +746,186 @@ class StreamProcessor:
                 ErrorSeverity.HIGH
             ) from e
     
+    def _drain_frames_sync(self) -> list[CascadeResult]:
+        """
+        处理缓冲区中的所有完整帧（在工作线程中调用）
+        
+        读帧转换、VAD推理和状态机处理全部同步执行，
+        整个音频块只需一次线程切换。
+        
+        Returns:
+            处理结果列表
+        """
+        # 读取所有完整帧，转换为float32写入预分配的批量缓冲区
+        frame_count = self.frame_buffer.available_frames()
+        frames = self._reserve_frame_batch(frame_count)
+        frames_data = [
+            self.frame_buffer.read_frame_into(frames[i])
+            for i in range(frame_count)
+        ]
+        
+        return self._process_frames_sync(frames, frames_data)
+    
+    def _process_single_frame_sync(self, frame_data: bytes | memoryview) -> list[CascadeResult]:
+        """
+        直接处理恰好一帧的音频块（在工作线程中调用）
+        
+        Args:
+            frame_data: 512样本的音频数据（1024字节）
+            
+        Returns:
+            处理结果列表
+        """
+        # 结果中的帧数据需要独立于调用方的缓冲区（bytes输入不会复制）
+        frame_data = bytes(frame_data)
+        frames = self._reserve_frame_batch(1)
+        np.multiply(
+            np.frombuffer(frame_data, dtype=np.int16),
+            _I16_TO_F32,
+            out=frames[0],
+            casting='unsafe'
+        )
+        
+        return self._process_frames_sync(frames, [frame_data])
+    
+    def _process_frames_sync(
+        self,
+        frames: np.ndarray,
+        frames_data: list[bytes]
+    ) -> list[CascadeResult]:
+        """
+        对一批已转换的帧执行VAD推理和状态机处理
+        
+        Args:
+            frames: 形状为(N, 512)的float32数组
+            frames_data: 每帧对应的原始音频数据
+            
+        Returns:
+            处理结果列表
+        """
+        results = []
+        
+        vad_results = self._run_vad_on_frames(frames)
+        emit_idle_frames = self.config.emit_idle_frames
+        
+        for frame_data, vad_result in zip(frames_data, vad_results):
+            self.frame_counter += 1
+            
+            if (
+                not emit_idle_frames
+                and vad_result is None
+                and not self.state_machine.is_collecting
+            ):
+                # 空闲状态的无语音帧只计数，不构造帧和结果对象
+                self.single_frames_count += 1
+                continue
+            
+            timestamp_ms = self.frame_counter * 32.0  # 32ms per frame
+            
+            frame = AudioFrame(
+                frame_id=self.frame_counter,
+                audio_data=frame_data,
+                timestamp_ms=timestamp_ms,
+                vad_result=vad_result
+            )
+            
+            # 与事件循环线程上的set_system_state互斥
+            with self._state_lock:
+                result = self.state_machine.process_frame(frame)
+            
+            if result:
+                # 更新统计
+                if result.is_speech_segment:
+                    self.speech_segments_count += 1
+                else:
+                    self.single_frames_count += 1
+                
+                results.append(result)
+        
+        return results
+    
+    def _reserve_frame_batch(self, frame_count: int) -> np.ndarray:
+        """
+        确保批量缓冲区至少容纳frame_count帧
+        
+        Args:
+            frame_count: 本次需要转换的帧数
+            
+        Returns:
+            缓冲区前frame_count行的视图，形状为(frame_count, 512)
+        """
+        if frame_count > len(self._f32_buf):
+            self._f32_tensor = torch.empty((frame_count, AUDIO_FRAME_SIZE), dtype=torch.float32)
+            self._f32_buf = self._f32_tensor.numpy()
+        return self._f32_buf[:frame_count]
+    
+    def _run_vad_on_frames(self, frames: np.ndarray) -> list[dict | None]:
+        """
+        依次对一批帧执行VAD推理（在工作线程中调用）
+        
+        VADIterator带有跨帧的LSTM状态，帧必须按顺序逐一推理；
+        这里只是把整批帧放进同一次线程切换中。
+        
+        Args:
+            frames: 形状为(N, 512)的float32数组
+            
+        Returns:
+            每帧对应的VAD结果
+        """
+        # 开启静音跳过时才需要每帧峰值（max/min不分配整批的临时数组）
+        if self.config.skip_silent_frames:
+            peaks = np.maximum(frames.max(axis=1), -frames.min(axis=1))
+        else:
+            peaks = None
+        
+        # ONNX迭代器直接接收numpy帧
+        if self.config.use_onnx:
+            return self._iterate_vad(frames, peaks)
+        
+        # TorchScript路径使用与缓冲区共享内存的张量，整块只进入一次推理模式
+        with torch.inference_mode():
+            return self._iterate_vad(self._f32_tensor[:len(frames)], peaks)
+    
+    def _iterate_vad(self, frames: np.ndarray | torch.Tensor, peaks: np.ndarray | None) -> list[dict | None]:
+        """
+        逐帧调用VAD迭代器
+        
+        传入peaks时（Config.skip_silent_frames）：未处于语音中且峰值低于
+        SILENCE_PEAK_THRESHOLD的静音帧直接判定为None，不执行模型推理；
+        每连续跳过SILENCE_REFRESH_INTERVAL帧仍执行一次推理，保持模型状态跟随音频。
+        语音中（triggered）的帧总是推理，end事件不受影响。
+        
+        Args:
+            frames: 可按行迭代的帧序列（numpy数组或torch张量）
+            peaks: 每帧的峰值，None表示不跳过
+            
+        Returns:
+            每帧对应的VAD结果
+        """
+        vad_iterator = self.vad_iterator
+        
+        if peaks is None:
+            return [vad_iterator(frame) for frame in frames]
+        
+        vad_results = []
+        
+        for frame, peak in zip(frames, peaks):
+            if (
+                peak < SILENCE_PEAK_THRESHOLD
+                and not vad_iterator.triggered
+                and self._skipped_silent_frames < SILENCE_REFRESH_INTERVAL
+            ):
+                # 跳过推理，但保持VADIterator的样本计数与音频同步
+                self._skipped_silent_frames += 1
+                vad_iterator.current_sample += len(frame)
+                vad_results.append(None)
+                continue
+            
+            self._skipped_silent_frames = 0
+            vad_results.append(vad_iterator(frame))
+        
+        return vad_results
+    
     async def process_file(self, file_path: str) -> AsyncIterator[CascadeResult]:
         """
         处理音频文件
@@ -707,12 +998,16 @@ class StreamProcessor:
                 ErrorSeverity.HIGH
             ) from e
     
-    async def close(self) -> None:
+    async def close(self, force_gc: bool = False) -> None:
         """
         清理资源并释放内存
         
         显式清理所有资源，包括PyTorch模型、缓冲区和状态机。
         使用超时保护防止清理过程阻塞。
+        
+        Args:
+            force_gc: 是否在清理后执行gc.collect()。全堆扫描会阻塞事件循环，
+                服务端断开连接时不应开启，仅供命令行/测试等一次性场景使用
         """
         try:
             # 1. 清理VAD迭代器状态
@@ -725,17 +1020,17 @@ class StreamProcessor:
             # 2. 显式清理PyTorch模型
             if self.model is not None:
                 try:
-                    # 如果使用GPU，清理CUDA缓存
-                    if torch.cuda.is_available() and next(self.model.parameters(), None) is not None:
-                        if next(self.model.parameters()).is_cuda:
-                            torch.cuda.empty_cache()
-                            logger.debug("已清理CUDA缓存")
+                    # 如果使用GPU，清理CUDA缓存（仅PyTorch模型）
+                    if self._model_device is not None and self._model_device.type == 'cuda':
+                        torch.cuda.empty_cache()
+                        logger.debug("已清理CUDA缓存")
                 except Exception as e:
                     logger.warning(f"清理CUDA缓存失败: {e}")
                 
                 # 删除模型引用
                 del self.model
                 self.model = None
+                self._model_device = None
             
             # 3. 清理VAD迭代器
             if self.vad_iterator is not None:
@@ -749,12 +1044,15 @@ class StreamProcessor:
             if self.state_machine:
                 self.state_machine.reset()
             
+            self._skipped_silent_frames = 0
+            
             # 5. 清理统计数据
             self.processing_times.clear()
             
-            # 6. 强制垃圾回收（在资源密集型应用中有助于及时释放内存）
-            import gc
-            gc.collect()
+            # 6. 可选的强制垃圾回收（全堆扫描，默认关闭以免阻塞事件循环）
+            if force_gc:
+                import gc
+                gc.collect()
             
             self.is_initialized = False
             logger.info("StreamProcessor已清理，所有资源已释放")
@@ -796,10 +1094,12 @@ class StreamProcessor:
                 num_samples = int(len(audio_data) * target_sample_rate / sample_rate)
                 audio_data = signal.resample(audio_data, num_samples)
             
-            # 转换为 float32 并归一化到 [-1, 1]
-            audio_data = audio_data.astype(np.float32)
-            if audio_data.max() > 1.0 or audio_data.min() < -1.0:
-                audio_data = audio_data / max(abs(audio_data.max()), abs(audio_data.min()))
+            # 转换为 float32 并归一化到 [-1, 1]（乘以float32倒数，原地完成）
+            audio_data = audio_data.astype(np.float32, copy=False)
+            # max/-min各遍历一次，不分配与整段音频等大的np.abs临时数组
+            peak = max(audio_data.max(), -audio_data.min()) if len(audio_data) else 0.0
+            if peak > 1.0:
+                np.multiply(audio_data, np.float32(1.0 / peak), out=audio_data)
             
             # 转换为 torch.Tensor
             return torch.from_numpy(audio_data)
@@ -818,29 +1118,20 @@ class StreamProcessor:
         Returns:
             音频帧列表（bytes格式）
         """
-        frames = []
+        # 如果是PyTorch Tensor，先转换为numpy数组
+        if isinstance(audio_data, torch.Tensor):
+            audio_data = audio_data.detach().numpy()
         
-        # 按512样本分块
-        for i in range(0, len(audio_data), frame_size):
-            frame = audio_data[i:i + frame_size]
-            
-            # 如果最后一帧不足512样本，跳过
-            if len(frame) < frame_size:
-                break
-            
-            # 如果是PyTorch Tensor，先转换为numpy数组
-            if hasattr(frame, 'numpy') and callable(getattr(frame, 'numpy', None)):
-                frame = frame.numpy()
-            elif hasattr(frame, 'detach') and callable(getattr(frame, 'detach', None)):
-                frame = frame.detach().numpy()
-            
-            frame_int16 = (frame * 32767).astype(np.int16)
-            frame_bytes = frame_int16.tobytes()
-            frames.append(frame_bytes)
+        # 按512样本分块，最后不足512样本的部分跳过
+        frame_count = len(audio_data) // frame_size
+        
+        # 整段一次性转换为int16，再按帧切分
+        audio_int16 = (audio_data[:frame_count * frame_size] * 32767).astype(np.int16)
+        frames = [frame.tobytes() for frame in audio_int16.reshape(frame_count, frame_size)]
         
         return frames
     
-    def _validate_audio_chunk(self, audio_data: bytes) -> None:
+    def _validate_audio_chunk(self, audio_data: bytes | memoryview) -> None:
         """
         验证音频块的基本完整性
         
@@ -878,17 +1169,17 @@ class StreamProcessor:
                 {"chunk_size": data_size}
             )
         
-        # 调试信息：全静音数据
-        if data_size >= 1024 and audio_data == b'\x00' * data_size:
-            logger.debug(f"检测到全静音音频数据: {data_size} bytes")
+        # 调试信息：全静音数据（仅在DEBUG级别检查）
+        # 按8字节整数扫描，遇到第一个非零值即停止，不分配额外缓冲区
+        if data_size >= 1024 and logger.isEnabledFor(logging.DEBUG):
+            aligned_size = data_size - data_size % 8
+            view = memoryview(audio_data)
+            if not any(view[:aligned_size].cast('Q')) and not any(view[aligned_size:]):
+                logger.debug(f"检测到全静音音频数据: {data_size} bytes")
     
     def _record_processing_time(self, processing_time_ms: float) -> None:
-        """记录处理时间"""
+        """记录处理时间（deque自动淘汰最旧的记录）"""
         self.processing_times.append(processing_time_ms)
-        
-        # 保持最近的处理时间记录
-        if len(self.processing_times) > self.max_processing_times:
-            self.processing_times.pop(0)
     
     def get_stats(self) -> ProcessorStats:
         """
@@ -896,10 +1187,12 @@ class StreamProcessor:
         
         包含性能告警检测，当指标异常时记录警告日志。
         """
+        total_processing_time_ms = self.total_processing_time_ns / 1e6
+        
         # 计算平均处理时间
         avg_processing_time = 0.0
         if self.total_chunks_processed > 0:
-            avg_processing_time = self.total_processing_time_ms / self.total_chunks_processed
+            avg_processing_time = total_processing_time_ms / self.total_chunks_processed
         
         # 计算语音比例
         total_results = self.speech_segments_count + self.single_frames_count
@@ -909,16 +1202,20 @@ class StreamProcessor:
         
         # 计算吞吐量
         throughput = 0.0
-        if self.total_processing_time_ms > 0:
-            throughput = self.total_chunks_processed / (self.total_processing_time_ms / 1000.0)
+        if self.total_processing_time_ns > 0:
+            throughput = self.total_chunks_processed / (self.total_processing_time_ns / 1e9)
         
         # 计算错误率
         error_rate = 0.0
         if self.total_chunks_processed > 0:
             error_rate = self.error_count / self.total_chunks_processed
         
-        # 估算内存使用（单实例约80MB）
-        memory_usage_mb = 80.0 if self.is_initialized else 0.0
+        # 估算本实例独占的内存：ONNX会话由进程内所有处理器共享，不计入单个实例，
+        # 实例只持有VAD流状态和音频缓冲区（流状态只有几KB，按缓冲区计算）
+        memory_usage_mb = 0.0
+        if self.is_initialized:
+            buffer_bytes = self.frame_buffer.allocated_bytes + self._f32_buf.nbytes
+            memory_usage_mb = buffer_bytes / (1024 * 1024)
         
         # 性能告警检测
         if self.total_chunks_processed > 10:  # 至少处理10个块后才告警
@@ -942,7 +1239,7 @@ class StreamProcessor:
         
         return ProcessorStats(
             total_chunks_processed=self.total_chunks_processed,
-            total_processing_time_ms=self.total_processing_time_ms,
+            total_processing_time_ms=total_processing_time_ms,
             average_processing_time_ms=avg_processing_time,
             speech_segments=self.speech_segments_count,
             single_frames=self.single_frames_count,
@@ -956,7 +1253,7 @@ class StreamProcessor:
     def reset_stats(self) -> None:
         """重置统计信息"""
         self.total_chunks_processed = 0
-        self.total_processing_time_ms = 0.0
+        self.total_processing_time_ns = 0
         self.speech_segments_count = 0
         self.single_frames_count = 0
         self.error_count = 0
@@ -970,7 +1267,8 @@ class StreamProcessor:
         Args:
             state: 要设置的系统状态
         """
-        self.interruption_manager.set_state(state)
+        with self._state_lock:
+            self.interruption_manager.set_state(state)
     
     def get_system_state(self) -> SystemState:
         """
@@ -184,10 +184,16 @@ class Config(BaseModel):
     vad_threshold: float = Field(default=0.5, description="VAD检测阈值", ge=0.0, le=1.0)
     speech_pad_ms: int = Field(default=100, description="语音段填充时长(ms)", ge=0, le=5000)
     min_silence_duration_ms: int = Field(default=100, description="最小静音时长(ms)", ge=0, le=10000)
+    use_onnx: bool = Field(default=True, description="是否使用ONNX Runtime推理（否则使用PyTorch JIT）")
 
     # 性能配置
     max_instances: int = Field(default=5, description="最大并发实例数", ge=1, le=20)
     buffer_size_frames: int = Field(default=64, description="缓冲区大小(帧数)", ge=8, le=256)
+    emit_idle_frames: bool = Field(default=True, description="是否输出空闲状态下的单帧结果（关闭时只计数）")
+    skip_silent_frames: bool = Field(
+        default=False,
+        description="空闲状态下跳过数字静音帧的模型推理（会改变长静音后的语音段起点）"
+    )
 
     # 高级配置
     enable_logging: bool = Field(default=True, description="是否启用日志")
@@ -246,7 +252,7 @@ class ProcessorStats(BaseModel):
 
     # 性能统计
     throughput_chunks_per_second: float = Field(description="吞吐量(块/秒)")
-    memory_usage_mb: float = Field(description="内存使用(MB)")
+    memory_usage_mb: float = Field(description="本实例独占的内存估算(MB)，不含共享的VAD模型")
 
     # 错误统计
     error_count: int = Field(description="错误次数")
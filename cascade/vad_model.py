@@ -0,0 +1,162 @@
+"""
+共享VAD模型
+
+Silero VAD的权重是只读的，只有LSTM状态和上下文与单个音频流相关。
+所有StreamProcessor共享同一个ONNX Runtime推理会话（InferenceSession.run线程安全），
+每个处理器只持有自己的VAD迭代器状态，内存占用不再随连接数线性增长。
+"""
+
+import functools
+import logging
+import threading
+from importlib import resources
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import onnxruntime
+
+logger = logging.getLogger(__name__)
+
+# 16kHz下每次推理拼接的上下文样本数（与silero-vad一致）
+_CONTEXT_SIZE = 64
+_FRAME_SIZE = 512
+
+_shared_session_lock = threading.Lock()
+
+
+@functools.cache
+def _load_onnx_session() -> "onnxruntime.InferenceSession":
+    """加载Silero VAD ONNX推理会话（结果被缓存，只在首次调用时加载）"""
+    import onnxruntime
+
+    # 与silero-vad的OnnxWrapper一致：单线程会话，仅使用CPU
+    opts = onnxruntime.SessionOptions()
+    opts.intra_op_num_threads = 1
+    opts.inter_op_num_threads = 1
+
+    model_path = resources.files("silero_vad.data").joinpath("silero_vad.onnx")
+    session = onnxruntime.InferenceSession(
+        str(model_path),
+        providers=["CPUExecutionProvider"],
+        sess_options=opts
+    )
+    logger.info("共享Silero VAD ONNX会话加载完成")
+    return session
+
+
+def get_shared_onnx_session() -> "onnxruntime.InferenceSession":
+    """
+    获取全局共享的Silero VAD ONNX推理会话
+
+    首次调用时加载模型（阻塞，应在线程池中调用），之后直接返回同一会话。
+    functools.cache不阻止并发的首次调用重复加载，因此在锁内访问缓存。
+
+    Returns:
+        onnxruntime.InferenceSession
+    """
+    with _shared_session_lock:
+        return _load_onnx_session()
+
+
+class SileroOnnxVADIterator:
+    """
+    基于共享ONNX会话的流式VAD迭代器
+
+    等价于silero-vad的VADIterator + OnnxWrapper，但直接接收numpy float32帧，
+    避免逐帧的torch张量包装和张量/数组往返转换。
+    共享推理会话，独立维护LSTM状态、上下文和语音起止判定状态。
+
+    每帧返回值与VADIterator一致：
+    - None: 无语音起止事件
+    - {'start': sample}: 语音开始
+    - {'end': sample}: 语音结束
+    """
+
+    def __init__(
+        self,
+        session: "onnxruntime.InferenceSession",
+        threshold: float = 0.5,
+        sampling_rate: int = 16000,
+        min_silence_duration_ms: int = 100,
+        speech_pad_ms: int = 30
+    ):
+        """
+        初始化VAD迭代器
+
+        Args:
+            session: 共享的ONNX推理会话
+            threshold: 语音概率阈值
+            sampling_rate: 采样率，仅支持16000
+            min_silence_duration_ms: 判定语音结束前需要的最小静音时长
+            speech_pad_ms: 语音段两端的填充时长
+        """
+        if sampling_rate != 16000:
+            raise ValueError(f"仅支持16000Hz采样率，当前: {sampling_rate}")
+
+        self.session = session
+        self.threshold = threshold
+        self.sampling_rate = sampling_rate
+        self.min_silence_samples = sampling_rate * min_silence_duration_ms / 1000
+        self.speech_pad_samples = sampling_rate * speech_pad_ms / 1000
+
+        # 预分配的推理输入：[上下文(64) | 当前帧(512)]
+        self._input = np.zeros((1, _CONTEXT_SIZE + _FRAME_SIZE), dtype=np.float32)
+        self._sr = np.array(sampling_rate, dtype=np.int64)
+        self.reset_states()
+
+    def reset_states(self) -> None:
+        """重置模型状态和语音起止判定状态"""
+        self._state = np.zeros((2, 1, 128), dtype=np.float32)
+        self._input.fill(0.0)
+        self.triggered = False
+        self.temp_end = 0
+        self.current_sample = 0
+
+    def __call__(self, x: np.ndarray) -> dict | None:
+        """
+        处理一帧音频
+
+        Args:
+            x: 512样本的float32音频
+
+        Returns:
+            VAD事件字典或None
+        """
+        model_input = self._input
+        model_input[0, _CONTEXT_SIZE:] = x
+
+        out, self._state = self.session.run(
+            None,
+            {"input": model_input, "state": self._state, "sr": self._sr}
+        )
+        speech_prob = float(out[0, 0])
+
+        # 本帧末尾作为下一帧的上下文
+        model_input[0, :_CONTEXT_SIZE] = model_input[0, -_CONTEXT_SIZE:]
+
+        self.current_sample += _FRAME_SIZE
+
+        if speech_prob >= self.threshold and self.temp_end:
+            self.temp_end = 0
+
+        if speech_prob >= self.threshold and not self.triggered:
+            self.triggered = True
+            speech_start = max(0, self.current_sample - self.speech_pad_samples - _FRAME_SIZE)
+            return {'start': int(speech_start)}
+
+        if speech_prob < self.threshold - 0.15 and self.triggered:
+            if not self.temp_end:
+                self.temp_end = self.current_sample
+            if self.current_sample - self.temp_end < self.min_silence_samples:
+                return None
+            speech_end = self.temp_end + self.speech_pad_samples - _FRAME_SIZE
+            self.temp_end = 0
+            self.triggered = False
+            return {'end': int(speech_end)}
+
+        return None
+
+
+__all__ = ["get_shared_onnx_session", "SileroOnnxVADIterator"]
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+帧对齐缓冲区测试脚本
+
+测试FrameAlignedBuffer的读写、搬移、溢出和float32融合读取。
+
+使用方法：
+    python tests/test_buffer.py -v
+"""
+
+import unittest
+
+import numpy as np
+
+from cascade import BufferError, FrameAlignedBuffer
+
+
+def make_pcm(num_samples: int, start: int = 0) -> bytes:
+    """生成递增的int16 PCM数据"""
+    return np.arange(start, start + num_samples, dtype=np.int16).tobytes()
+
+
+class TestFrameAlignedBuffer(unittest.TestCase):
+    """FrameAlignedBuffer 单元测试"""
+
+    def setUp(self):
+        """测试前初始化"""
+        self.buffer = FrameAlignedBuffer(max_buffer_samples=2048)
+
+    def test_partial_writes_form_frame(self):
+        """测试多次不足一帧的写入拼成完整帧"""
+        self.buffer.write(make_pcm(300))
+        self.assertFalse(self.buffer.has_complete_frame())
+        self.assertIsNone(self.buffer.read_frame())
+
+        self.buffer.write(make_pcm(300, start=300))
+        self.assertTrue(self.buffer.has_complete_frame())
+        self.assertEqual(self.buffer.read_frame(), make_pcm(512))
+        self.assertEqual(self.buffer.available_samples(), 88)
+        self.assertEqual(self.buffer.buffer_size_bytes, 176)
+
+    def test_compaction_preserves_order(self):
+        """测试尾部空间不足时搬移未读数据，顺序不变"""
+        self.buffer.write(make_pcm(1800))
+        self.buffer.read_frame()
+        self.buffer.read_frame()
+        self.buffer.write(make_pcm(1000, start=1800))
+
+        self.assertEqual(self.buffer.available_samples(), 1776)
+        self.assertEqual(self.buffer.read_frame(), make_pcm(512, start=1024))
+
+    def test_overflow_clears_and_keeps_new_data(self):
+        """测试溢出时清空旧数据，保留新写入的数据"""
+        self.buffer.write(make_pcm(1500))
+        self.buffer.write(make_pcm(1000, start=5000))
+
+        self.assertEqual(self.buffer.available_samples(), 1000)
+        self.assertEqual(self.buffer.read_frame(), make_pcm(512, start=5000))
+
+    def test_oversized_write_is_kept(self):
+        """测试单次写入超过容量时完整保留"""
+        self.buffer.write(make_pcm(3000))
+
+        self.assertEqual(self.buffer.available_frames(), 5)
+        self.assertEqual(self.buffer.read_frame(), make_pcm(512))
+
+    def test_read_frame_into(self):
+        """测试读取帧并融合转换为float32"""
+        pcm = np.array([0, 16384, -32768, 32767] * 128, dtype=np.int16)
+        self.buffer.write(pcm.tobytes())
+        out = np.empty(512, dtype=np.float32)
+
+        frame_data = self.buffer.read_frame_into(out)
+
+        self.assertEqual(frame_data, pcm.tobytes())
+        np.testing.assert_array_equal(out, pcm.astype(np.float32) / 32768.0)
+        self.assertIsNone(self.buffer.read_frame_into(out))
+
+    def test_unaligned_write_rejected(self):
+        """测试非16-bit对齐的数据被拒绝"""
+        with self.assertRaises(BufferError):
+            self.buffer.write(b'\x00\x01\x02')
+
+    def test_clear(self):
+        """测试清空缓冲区"""
+        self.buffer.write(make_pcm(1024))
+        self.buffer.clear()
+
+        self.assertEqual(self.buffer.available_samples(), 0)
+        self.assertEqual(self.buffer.get_buffer_usage_ratio(), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,423 @@
+#!/usr/bin/env python3
+"""
+StreamProcessor 测试脚本
+
+测试流处理器的并发与取消安全性、并发上限、memoryview输入、空闲帧输出开关、TorchScript推理路径、
+静音帧跳过，以及float32输入接口。
+
+使用方法：
+    python tests/test_stream_processor.py -v
+"""
+
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import AsyncMock, patch
+
+import numpy as np
+
+from audio_fixtures import make_word, to_pcm
+from cascade import CascadeError, Config, ErrorCode, StreamProcessor
+from cascade.processor import MAX_INFLIGHT_CHUNKS, SILENCE_REFRESH_INTERVAL
+
+
+def make_noise(num_frames: int, seed: int = 0) -> bytes:
+    """生成指定帧数的int16噪声PCM（非静音）"""
+    rng = np.random.default_rng(seed)
+    return rng.integers(-8000, 8000, num_frames * 512, dtype=np.int16).tobytes()
+
+
+class CountingSession:
+    """包装ONNX会话：记录每次推理时迭代器的样本位置"""
+
+    def __init__(self, session, iterator):
+        self._session = session
+        self._iterator = iterator
+        self.run_samples = []
+
+    def run(self, *args, **kwargs):
+        self.run_samples.append(self._iterator.current_sample)
+        return self._session.run(*args, **kwargs)
+
+
+class SlowVADIterator:
+    """包装VAD迭代器：每帧推理变慢，并记录同时运行的推理数"""
+
+    def __init__(self, inner, delay_s: float):
+        self._inner = inner
+        self._delay_s = delay_s
+        self._lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+        self.calls = 0
+
+    def __call__(self, frame):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self._delay_s)
+            return self._inner(frame)
+        finally:
+            with self._lock:
+                self.active -= 1
+                self.calls += 1
+
+    def __getattr__(self, name):
+        return getattr(self._inner, name)
+
+
+class TestStreamProcessorCancellation(unittest.IsolatedAsyncioTestCase):
+    """process_chunk 取消安全性测试"""
+
+    async def asyncSetUp(self):
+        """测试前初始化"""
+        self.processor = StreamProcessor(Config())
+        await self.processor.initialize()
+        self.slow = SlowVADIterator(self.processor.vad_iterator, delay_s=0.02)
+        self.processor.vad_iterator = self.slow
+
+    async def asyncTearDown(self):
+        """测试后清理"""
+        self.processor.vad_iterator = self.slow._inner
+        await self.processor.close()
+
+    async def test_cancelled_chunk_finishes_before_next(self):
+        """测试被取消的块在工作线程结束前不释放流，下一个块不会并发推理"""
+        task = asyncio.create_task(self.processor.process_chunk(make_noise(4)))
+        await asyncio.sleep(0.01)
+        task.cancel()
+
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+
+        # 取消在工作线程结束后才传播
+        self.assertEqual(self.slow.active, 0)
+        self.assertEqual(self.slow.calls, 4)
+
+        await self.processor.process_chunk(make_noise(2, seed=1))
+        self.assertEqual(self.slow.max_active, 1)
+        self.assertEqual(self.slow.calls, 6)
+
+    async def test_cancelled_fast_path_frame(self):
+        """测试单帧快速路径被取消时同样等待工作线程结束"""
+        task = asyncio.create_task(self.processor.process_chunk(make_noise(1)))
+        await asyncio.sleep(0.005)
+        task.cancel()
+
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+
+        self.assertEqual(self.slow.active, 0)
+        await self.processor.process_chunk(make_noise(1, seed=1))
+        self.assertEqual(self.slow.max_active, 1)
+
+
+class TestInflightLimit(unittest.IsolatedAsyncioTestCase):
+    """process_chunk 并发上限测试"""
+
+    async def asyncSetUp(self):
+        """测试前初始化"""
+        self.processor = StreamProcessor(Config())
+        await self.processor.initialize()
+
+    async def asyncTearDown(self):
+        """测试后清理"""
+        await self.processor.close()
+
+    async def test_calls_past_limit_rejected(self):
+        """测试超过MAX_INFLIGHT_CHUNKS的调用立即抛出RESOURCE_EXHAUSTED，而不是排队等待"""
+        release = asyncio.Event()
+
+        async def blocked(audio_data):
+            await release.wait()
+            return []
+
+        with patch.object(self.processor, "_process_chunk_internal", blocked):
+            tasks = [
+                asyncio.create_task(self.processor.process_chunk(make_noise(1)))
+                for _ in range(MAX_INFLIGHT_CHUNKS + 10)
+            ]
+            await asyncio.sleep(0)
+
+            rejected = [task for task in tasks if task.done()]
+            self.assertEqual(len(rejected), 10)
+            for task in rejected:
+                with self.assertRaises(CascadeError) as context:
+                    await task
+                self.assertEqual(context.exception.error_code, ErrorCode.RESOURCE_EXHAUSTED)
+            self.assertEqual(self.processor._inflight_chunks, MAX_INFLIGHT_CHUNKS)
+
+            release.set()
+            await asyncio.gather(*(task for task in tasks if task not in rejected))
+
+        self.assertEqual(self.processor._inflight_chunks, 0)
+
+    async def test_count_released_when_processing_raises(self):
+        """测试处理抛出异常时并发计数同样归零"""
+        failing = AsyncMock(side_effect=RuntimeError("boom"))
+
+        with patch.object(self.processor, "_process_chunk_internal", failing):
+            results = await asyncio.gather(
+                *(self.processor.process_chunk(make_noise(1)) for _ in range(3)),
+                return_exceptions=True
+            )
+
+        self.assertTrue(all(isinstance(result, RuntimeError) for result in results))
+        self.assertEqual(self.processor._inflight_chunks, 0)
+        # 计数归零后可以继续正常处理
+        self.assertIsInstance(await self.processor.process_chunk(make_noise(1)), list)
+
+
+class TestMemoryviewInput(unittest.IsolatedAsyncioTestCase):
+    """process_chunk memoryview输入测试"""
+
+    async def asyncSetUp(self):
+        """测试前初始化"""
+        self.processor = StreamProcessor(Config())
+        await self.processor.initialize()
+
+    async def asyncTearDown(self):
+        """测试后清理"""
+        await self.processor.close()
+
+    async def test_matches_bytes(self):
+        """测试连续内存的memoryview（包括int16数组的视图）与bytes结果一致"""
+        samples = np.frombuffer(make_noise(3), dtype=np.int16)
+
+        results = await self.processor.process_chunk(memoryview(samples))
+
+        async with StreamProcessor(Config()) as reference:
+            expected = await reference.process_chunk(samples.tobytes())
+        self.assertEqual(
+            [r.frame.audio_data for r in results],
+            [r.frame.audio_data for r in expected]
+        )
+
+    async def test_non_contiguous_rejected(self):
+        """测试非连续的memoryview抛出INVALID_INPUT，而不是TypeError"""
+        samples = np.frombuffer(make_noise(2), dtype=np.int16)
+
+        with self.assertRaises(CascadeError) as context:
+            await self.processor.process_chunk(memoryview(samples)[::2])
+
+        self.assertEqual(context.exception.error_code, ErrorCode.INVALID_INPUT)
+        self.assertEqual(self.processor._inflight_chunks, 0)
+
+
+class TestEmitIdleFrames(unittest.IsolatedAsyncioTestCase):
+    """空闲帧输出开关（Config.emit_idle_frames）测试"""
+
+    async def run_processor(self, pcm: bytes, chunk_size: int, emit_idle_frames: bool):
+        """按chunk_size分块送入音频，返回(全部结果, 统计)"""
+        results = []
+        async with StreamProcessor(Config(emit_idle_frames=emit_idle_frames)) as processor:
+            for start in range(0, len(pcm), chunk_size):
+                results.extend(await processor.process_chunk(pcm[start:start + chunk_size]))
+            return results, processor.get_stats()
+
+    async def test_same_segments_without_idle_frames(self):
+        """测试关闭后语音段和单帧计数不变，只是不再返回空闲帧结果"""
+        rng = np.random.default_rng(0)
+        # 语音紧跟在空闲帧之后开始（包括同一音频块内），覆盖is_collecting判断
+        audio = np.concatenate([
+            rng.normal(0, 0.002, 16000).astype(np.float32),
+            make_word(),
+            rng.normal(0, 0.002, 24000).astype(np.float32),
+            make_word(f0=140.0),
+            np.zeros(16000, dtype=np.float32),
+        ])
+        pcm = to_pcm(audio)
+
+        # 1024字节走单帧快速路径，4096字节走批量路径
+        for chunk_size in (1024, 4096):
+            with self.subTest(chunk_size=chunk_size):
+                emitting, emitting_stats = await self.run_processor(pcm, chunk_size, True)
+                counting, counting_stats = await self.run_processor(pcm, chunk_size, False)
+
+                emitting_segments = [
+                    (r.segment.start_timestamp_ms, r.segment.end_timestamp_ms, r.segment.audio_data)
+                    for r in emitting if r.is_speech_segment
+                ]
+                counting_segments = [
+                    (r.segment.start_timestamp_ms, r.segment.end_timestamp_ms, r.segment.audio_data)
+                    for r in counting if r.is_speech_segment
+                ]
+                self.assertEqual(len(emitting_segments), 2)
+                self.assertEqual(counting_segments, emitting_segments)
+
+                self.assertGreater(emitting_stats.single_frames, 0)
+                self.assertEqual(counting_stats.single_frames, emitting_stats.single_frames)
+                self.assertEqual(counting_stats.speech_segments, emitting_stats.speech_segments)
+
+                self.assertTrue(any(r.result_type == "frame" for r in emitting))
+                self.assertFalse(any(r.result_type == "frame" for r in counting))
+
+
+class TestTorchScriptPath(unittest.IsolatedAsyncioTestCase):
+    """TorchScript推理路径（Config(use_onnx=False)）测试"""
+
+    async def segments(self, pcm: bytes, chunk_size: int, use_onnx: bool) -> list[tuple[float, float, bytes]]:
+        """按chunk_size分块送入音频，返回(起点, 终点, 音频)的语音段列表"""
+        segments = []
+        async with StreamProcessor(Config(use_onnx=use_onnx)) as processor:
+            for start in range(0, len(pcm), chunk_size):
+                for result in await processor.process_chunk(pcm[start:start + chunk_size]):
+                    if result.is_speech_segment:
+                        segment = result.segment
+                        segments.append((segment.start_timestamp_ms, segment.end_timestamp_ms, segment.audio_data))
+        return segments
+
+    async def test_matches_onnx(self):
+        """测试与ONNX路径产生相同的语音段（共享张量缓冲区在帧对齐和非对齐分块下都正确）"""
+        rng = np.random.default_rng(0)
+        audio = np.concatenate([
+            rng.normal(0, 0.002, 16000).astype(np.float32),
+            make_word(),
+            rng.normal(0, 0.002, 24000).astype(np.float32),
+            make_word(f0=140.0),
+            np.zeros(16000, dtype=np.float32),
+        ])
+        pcm = to_pcm(audio)
+
+        # 1024字节为单帧快速路径；3000字节不与帧对齐，每次批量帧数不同
+        for chunk_size in (1024, 3000):
+            with self.subTest(chunk_size=chunk_size):
+                onnx_segments = await self.segments(pcm, chunk_size, use_onnx=True)
+                jit_segments = await self.segments(pcm, chunk_size, use_onnx=False)
+
+                self.assertEqual(len(onnx_segments), 2)
+                self.assertEqual(jit_segments, onnx_segments)
+
+
+class TestSilenceSkip(unittest.IsolatedAsyncioTestCase):
+    """静音帧跳过（Config.skip_silent_frames）测试"""
+
+    async def make_processor(self, skip_silent_frames: bool) -> StreamProcessor:
+        """创建已初始化的处理器，并统计模型推理次数"""
+        processor = StreamProcessor(Config(skip_silent_frames=skip_silent_frames))
+        await processor.initialize()
+        self.addAsyncCleanup(processor.close)
+        iterator = processor.vad_iterator
+        iterator.session = CountingSession(iterator.session, iterator)
+        return processor
+
+    async def feed(self, processor: StreamProcessor, pcm: bytes) -> list[tuple[int, float, float]]:
+        """逐帧送入音频，返回(产生结果的帧序号, 起点, 终点)的语音段列表"""
+        segments = []
+        for index in range(len(pcm) // 1024):
+            for result in await processor.process_chunk(pcm[index * 1024:(index + 1) * 1024]):
+                if result.is_speech_segment:
+                    segments.append((
+                        index,
+                        result.segment.start_timestamp_ms,
+                        result.segment.end_timestamp_ms
+                    ))
+        return segments
+
+    async def test_disabled_by_default(self):
+        """测试默认不跳过：每个静音帧都执行推理"""
+        self.assertFalse(Config().skip_silent_frames)
+        processor = await self.make_processor(skip_silent_frames=False)
+
+        await self.feed(processor, bytes(120 * 1024))
+
+        self.assertEqual(len(processor.vad_iterator.session.run_samples), 120)
+
+    async def test_skip_and_refresh_cadence(self):
+        """测试连续跳过SILENCE_REFRESH_INTERVAL帧后推理一次，样本计数始终与音频对齐"""
+        processor = await self.make_processor(skip_silent_frames=True)
+        interval = SILENCE_REFRESH_INTERVAL
+
+        await self.feed(processor, bytes((2 * interval + 20) * 1024))
+
+        # 第interval+1帧和第2*interval+2帧执行推理，推理前迭代器位于该帧起点
+        self.assertEqual(
+            processor.vad_iterator.session.run_samples,
+            [interval * 512, (2 * interval + 1) * 512]
+        )
+        self.assertEqual(processor.vad_iterator.current_sample, (2 * interval + 20) * 512)
+
+    async def test_end_event_not_delayed(self):
+        """测试语音中的帧总是推理，语音段结束与不跳过时完全一致"""
+        rng = np.random.default_rng(0)
+        audio = np.concatenate([
+            rng.normal(0, 0.002, 16000).astype(np.float32),
+            make_word(),
+            np.zeros(3 * 16000, dtype=np.float32),
+        ])
+        pcm = to_pcm(audio)
+
+        baseline = await self.feed(await self.make_processor(skip_silent_frames=False), pcm)
+        skipping_processor = await self.make_processor(skip_silent_frames=True)
+        skipping = await self.feed(skipping_processor, pcm)
+
+        self.assertEqual(len(baseline), 1)
+        self.assertEqual(skipping, baseline)
+        # 结束后的静音确实被跳过
+        self.assertLess(
+            len(skipping_processor.vad_iterator.session.run_samples),
+            len(pcm) // 1024
+        )
+
+
+class TestProcessFloat(unittest.IsolatedAsyncioTestCase):
+    """process_float 测试"""
+
+    async def asyncSetUp(self):
+        """测试前初始化"""
+        self.processor = StreamProcessor(Config())
+        await self.processor.initialize()
+
+    async def asyncTearDown(self):
+        """测试后清理"""
+        await self.processor.close()
+
+    async def test_matches_process_chunk_on_quantized_pcm(self):
+        """测试与对rint量化后的PCM调用process_chunk结果一致"""
+        rng = np.random.default_rng(0)
+        audio = np.concatenate([
+            rng.normal(0, 0.002, 16000).astype(np.float32),
+            make_word(),
+            rng.normal(0, 0.002, 16000).astype(np.float32),
+        ])
+        pcm = np.rint(audio * 32767).astype(np.int16).tobytes()
+
+        float_segments = []
+        for start in range(0, len(audio), 2048):
+            for result in await self.processor.process_float(audio[start:start + 2048]):
+                if result.is_speech_segment:
+                    float_segments.append(result.segment)
+
+        async with StreamProcessor(Config()) as reference:
+            pcm_segments = []
+            for start in range(0, len(pcm), 4096):
+                for result in await reference.process_chunk(pcm[start:start + 4096]):
+                    if result.is_speech_segment:
+                        pcm_segments.append(result.segment)
+
+        self.assertEqual(len(float_segments), 1)
+        self.assertEqual(
+            [(s.start_timestamp_ms, s.end_timestamp_ms, s.audio_data) for s in float_segments],
+            [(s.start_timestamp_ms, s.end_timestamp_ms, s.audio_data) for s in pcm_segments]
+        )
+
+    async def test_out_of_range_values_clipped(self):
+        """测试超出[-1, 1]的样本被截断，而不是整数溢出"""
+        audio = np.array([1.5, -1.5, 1.0, -1.0, 0.5, 0.0], dtype=np.float32)
+
+        with patch.object(self.processor, "process_chunk", AsyncMock(return_value=[])) as process_chunk:
+            await self.processor.process_float(audio)
+
+        pcm = np.frombuffer(process_chunk.call_args.args[0], dtype=np.int16)
+        np.testing.assert_array_equal(pcm, [32767, -32768, 32767, -32767, 16384, 0])
+
+    async def test_multichannel_rejected(self):
+        """测试二维（多声道）数组被拒绝"""
+        with self.assertRaises(CascadeError):
+            await self.processor.process_float(np.zeros((1024, 2), dtype=np.float32))
+
+
+if __name__ == "__main__":
+    unittest.main()
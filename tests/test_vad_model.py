@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+共享VAD模型测试脚本
+
+对比SileroOnnxVADIterator与silero-vad官方VADIterator(OnnxWrapper)的逐帧输出。
+
+使用方法：
+    python tests/test_vad_model.py -v
+"""
+
+import unittest
+
+import numpy as np
+import torch
+from silero_vad import VADIterator, load_silero_vad
+
+from audio_fixtures import make_word
+from cascade.vad_model import SileroOnnxVADIterator, get_shared_onnx_session
+
+
+def make_test_audio() -> np.ndarray:
+    """噪声、语音和数字静音交替的合成音频（按512样本帧对齐）"""
+    rng = np.random.default_rng(0)
+
+    def noise(seconds: float) -> np.ndarray:
+        return rng.normal(0, 0.002, int(seconds * 16000)).astype(np.float32)
+
+    def silence(seconds: float) -> np.ndarray:
+        return np.zeros(int(seconds * 16000), dtype=np.float32)
+
+    audio = np.concatenate([
+        noise(1), make_word(), noise(1), make_word(130),
+        silence(2), make_word(110), silence(1),
+    ])
+    return audio[:len(audio) // 512 * 512]
+
+
+class TestSileroOnnxVADIterator(unittest.TestCase):
+    """SileroOnnxVADIterator 与官方实现一致性测试"""
+
+    @classmethod
+    def setUpClass(cls):
+        """加载音频和官方ONNX模型"""
+        cls.frames = make_test_audio().reshape(-1, 512)
+        cls.reference_model = load_silero_vad(onnx=True)
+
+    def compare(self, **params):
+        """逐帧对比两个迭代器的事件"""
+        reference = VADIterator(self.reference_model, **params)
+        iterator = SileroOnnxVADIterator(get_shared_onnx_session(), **params)
+
+        expected = [reference(torch.from_numpy(frame)) for frame in self.frames]
+        actual = [iterator(frame) for frame in self.frames]
+
+        self.assertEqual(actual, expected)
+        # 测试音频中至少包含多次语音起止
+        self.assertGreaterEqual(sum(event is not None for event in expected), 4)
+
+    def test_default_params(self):
+        """测试默认参数下逐帧事件一致"""
+        self.compare()
+
+    def test_processor_params(self):
+        """测试StreamProcessor默认配置（100ms填充/100ms静音）下逐帧事件一致"""
+        self.compare(threshold=0.5, min_silence_duration_ms=100, speech_pad_ms=100)
+
+    def test_reset_states(self):
+        """测试重置后与新建迭代器的输出一致"""
+        iterator = SileroOnnxVADIterator(get_shared_onnx_session())
+        first = [iterator(frame) for frame in self.frames]
+        iterator.reset_states()
+        second = [iterator(frame) for frame in self.frames]
+
+        self.assertEqual(second, first)
+
+
+if __name__ == "__main__":
+    unittest.main()
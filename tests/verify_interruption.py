@@ -11,46 +11,158 @@
 
 import asyncio
 import logging
+import logging.handlers
+import mmap
+import os
 import sys
+from collections import deque
+from math import gcd
+
 import numpy as np
 import soundfile as sf
 
-# 配置日志
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    stream=sys.stdout
+# 配置日志：记录先缓存在内存中，攒满一批或出现ERROR时才写出，避免逐条刷新stdout
+log_output = logging.StreamHandler(sys.stdout)
+log_output.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+log_buffer = logging.handlers.MemoryHandler(
+    capacity=256,
+    flushLevel=logging.ERROR,
+    target=log_output
 )
+logging.basicConfig(level=logging.INFO, handlers=[log_buffer])
 logger = logging.getLogger(__name__)
 
 from cascade import (
+    AUDIO_FRAME_SIZE,
     Config, InterruptionConfig, StreamProcessor, SystemState
 )
 
 AUDIO_FILE = "../我现在开始录音，理论上会有两个文件.wav"
+RESAMPLE_CACHE_SUFFIX = ".f32.16k.mono.raw"  # 重采样结果缓存文件后缀（单声道float32）
+CHUNK_SAMPLES = AUDIO_FRAME_SIZE * 4  # 每次发送4个完整VAD帧（2048样本，128ms）
+PIPELINE_DEPTH = 2  # 同时提交给处理器的音频块数
+
+async def pipelined_results(process, audio_chunks, depth=PIPELINE_DEPTH):
+    """
+    流水线方式提交音频块，按提交顺序逐块产出处理结果
+    
+    最多保持depth个块在处理中，处理器按提交顺序串行处理，
+    上一块推理时下一块已经读取并排队，避免逐块等待。
+    process为processor.process_chunk或processor.process_float。
+    """
+    create_task = asyncio.create_task
+    pending = deque()
+    try:
+        for chunk in audio_chunks:
+            pending.append(create_task(process(chunk)))
+            if len(pending) >= depth:
+                yield await pending.popleft()
+        while pending:
+            yield await pending.popleft()
+    finally:
+        for task in pending:
+            task.cancel()
+
+def resample_to_16k(audio_path):
+    """
+    读取整个音频文件，多声道混合为单声道，并重采样到16kHz
+    
+    文件在本函数（工作线程）内打开和关闭：调用方被取消时线程仍会执行完，
+    不会出现文件在读取过程中被其他线程关闭的情况。
+    
+    Args:
+        audio_path: 音频文件路径
+        
+    Returns:
+        16kHz单声道float32音频
+    """
+    with sf.SoundFile(audio_path) as audio_file:
+        audio_data = audio_file.read(dtype='float32')
+        sample_rate = audio_file.samplerate
+    if audio_data.ndim == 2:
+        audio_data = audio_data.mean(axis=1, dtype=np.float32)
+    
+    # scipy导入较慢，只在确实需要重采样时导入
+    from scipy.signal import resample_poly
+    
+    # 多相滤波重采样，耗时与长度成正比，不受FFT长度因子分解影响
+    # 整数升降采样比精确对应目标采样率（limit_denominator近似会改变输出采样率）
+    g = gcd(16000, sample_rate)
+    audio_data = resample_poly(audio_data, 16000 // g, sample_rate // g)
+    return audio_data.astype(np.float32, copy=False)
+
+def write_audio_cache(cache_file, audio_data):
+    """先写临时文件再替换，避免中断时留下不完整的缓存"""
+    tmp_file = cache_file + ".tmp"
+    with open(tmp_file, 'wb') as f:
+        f.write(audio_data)
+    os.replace(tmp_file, cache_file)
+
+def stream_pcm_blocks(audio_path):
+    """
+    按块读取16kHz int16 PCM（多声道混合为单声道）
+    
+    文件在开始迭代时才打开，读完或生成器被关闭时关闭；未被迭代的生成器不占用文件。
+    blocks()每次返回新数组，直接以memoryview送入处理器，无需tobytes()复制。
+    """
+    with sf.SoundFile(audio_path) as audio_file:
+        for block in audio_file.blocks(blocksize=CHUNK_SAMPLES, dtype='int16'):
+            if block.ndim == 2:
+                mono = (block.sum(axis=1, dtype=np.int32) // block.shape[1]).astype(np.int16)
+            else:
+                mono = block
+            yield memoryview(mono)
+
+async def prepare_audio(audio_path):
+    """
+    打开音频文件，准备送入处理器的音频块
+    
+    Args:
+        audio_path: 音频文件路径
+        
+    Returns:
+        (音频块序列, 音频块是否为float32)
+    """
+    # 只读取文件头信息，文件随即关闭；实际读取由stream_pcm_blocks或resample_to_16k各自打开
+    info = sf.info(audio_path)
+    sample_rate = info.samplerate
+    print(f"音频加载成功: {info.frames} 样本, {sample_rate} Hz, {info.frames/sample_rate:.2f} 秒")
+    
+    if sample_rate == 16000:
+        # 采样率一致：按块直接读取int16 PCM，不在内存中保留整段音频
+        return stream_pcm_blocks(audio_path), False
+    
+    # 重采样后的float32音频直接送入process_float，无需先转换为int16字节
+    # 重采样结果是确定的：缓存比音频文件新时直接复用
+    cache_file = audio_path + RESAMPLE_CACHE_SUFFIX
+    if (
+        os.path.exists(cache_file)
+        and os.path.getmtime(cache_file) >= os.path.getmtime(audio_path)
+    ):
+        print(f"使用重采样缓存: {cache_file}")
+    else:
+        print("需要重采样到 16000 Hz...")
+        # 读取和重采样是耗时的同步计算，放到线程池中执行，不阻塞事件循环
+        audio_data = await asyncio.to_thread(resample_to_16k, audio_path)
+        await asyncio.to_thread(write_audio_cache, cache_file, audio_data)
+    
+    # 只读映射缓存文件，音频块是映射内存上的数组切片，不复制数据
+    with open(cache_file, 'rb') as f:
+        audio_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    audio_data = np.frombuffer(audio_map, dtype=np.float32)
+    
+    # 预先切好全部块，送入循环只需遍历列表
+    audio_chunks = [
+        audio_data[i:i+CHUNK_SAMPLES]
+        for i in range(0, len(audio_data), CHUNK_SAMPLES)
+    ]
+    return audio_chunks, True
 
 async def main():
     print("\n=== 开始打断功能验证 ===")
     print(f"音频文件: {AUDIO_FILE}")
     
-    # 1. 准备音频数据
-    try:
-        audio_data, sample_rate = sf.read(AUDIO_FILE, dtype='float32')
-        print(f"音频加载成功: {len(audio_data)} 样本, {sample_rate} Hz, {len(audio_data)/sample_rate:.2f} 秒")
-        
-        if sample_rate != 16000:
-            print("需要重采样到 16000 Hz...")
-            from scipy import signal
-            audio_data = signal.resample(audio_data, int(len(audio_data) * 16000 / sample_rate))
-            
-        # 转为 int16 bytes
-        audio_int16 = (audio_data * 32767).astype(np.int16)
-        audio_bytes = audio_int16.tobytes()
-    except Exception as e:
-        print(f"❌ 音频读取失败: {e}")
-        return
-
-    # 2. 配置处理器
+    # 1. 配置处理器
     config = Config(
         vad_threshold=0.5,
         interruption_config=InterruptionConfig(
@@ -59,56 +171,89 @@ async def main():
         )
     )
 
-    # 3. 运行模拟流程
-    async with StreamProcessor(config) as processor:
-        print("Processor 初始化完成\n")
-        
-        chunk_size = 1024 # 每次发送 1024 字节
-        total_bytes = len(audio_bytes)
-        segment_count = 0
-        interruption_triggered = False
-        
-        # 模拟状态变量
-        simulated_responding = False
+    # 2. 准备音频数据：在后台进行，与处理器加载模型重叠
+    prepare_task = asyncio.create_task(prepare_audio(AUDIO_FILE))
 
-        for i in range(0, total_bytes, chunk_size):
-            chunk = audio_bytes[i:i+chunk_size]
-            results = await processor.process_chunk(chunk)
+    # 3. 运行模拟流程
+    try:
+        async with StreamProcessor(config) as processor:
+            print("Processor 初始化完成\n")
+            
+            try:
+                audio_chunks, feed_float = await prepare_task
+            except Exception as e:
+                print(f"❌ 音频读取失败: {e}")
+                return
+            
+            segment_count = 0
+            interruption_triggered = False
             
-            # --- 状态模拟逻辑 ---
-            # 如果已经处理完第一个语音段(segment_count >= 1)，并且还没进入过模拟状态
-            # 我们强制把系统状态设为 RESPONDING，假装系统正在说话
-            if segment_count == 1 and not simulated_responding:
-                # 检查当前是否空闲，如果是空闲，我们模拟系统开始回复
-                if processor.get_system_state() == SystemState.IDLE:
-                    print("\n>>> [模拟] 第一段语音结束，系统开始思考并回复...")
-                    processor.set_system_state(SystemState.PROCESSING)
-                    processor.set_system_state(SystemState.RESPONDING)
-                    print(f">>> [状态] 当前系统状态已切换为: {processor.get_system_state().value} (等待打断)\n")
-                    simulated_responding = True
-
-            # --- 结果处理 ---
-            for result in results:
-                if result.is_interruption:
-                    print(f"\n🛑 [成功] 检测到打断事件!")
-                    print(f"   时间戳: {result.interruption.timestamp_ms:.0f}ms")
-                    print(f"   被打断的状态: {result.interruption.system_state.value}")
-                    interruption_triggered = True
-                    
-                    # 模拟：被打断后，业务逻辑应该停止回复，并准备聆听
-                    # 注意：Manager会自动切换到 COLLECTING，不需要我们手动切
-                    # 但业务层应该知道自己被打断了
-                    
-                elif result.is_speech_segment:
-                    segment_count += 1
-                    seg = result.segment
-                    print(f"🎤 [语音段 #{segment_count}] {seg.start_timestamp_ms:.0f}ms -> {seg.end_timestamp_ms:.0f}ms (时长: {seg.duration_ms:.0f}ms)")
-                    
-                    # 如果这是打断后的语音段，说明打断流程完整走通了
-                    if interruption_triggered and segment_count == 2:
-                        print("   (这是打断系统回复后录制的语音)")
-                        # 语音结束，业务处理完成，回到IDLE
-                        processor.set_system_state(SystemState.IDLE)
+            # 模拟状态变量
+            simulated_responding = False
+            
+            # 循环内频繁使用的方法和状态绑定为局部变量
+            process = processor.process_float if feed_float else processor.process_chunk
+            get_state = processor.get_system_state
+            set_state = processor.set_system_state
+            IDLE = SystemState.IDLE
+            PROCESSING = SystemState.PROCESSING
+            RESPONDING = SystemState.RESPONDING
+
+            async for results in pipelined_results(process, audio_chunks):
+                # --- 状态模拟逻辑 ---
+                # 如果已经处理完第一个语音段(segment_count >= 1)，并且还没进入过模拟状态
+                # 我们强制把系统状态设为 RESPONDING，假装系统正在说话
+                if segment_count == 1 and not simulated_responding:
+                    # 检查当前是否空闲，如果是空闲，我们模拟系统开始回复
+                    if get_state() == IDLE:
+                        print("\n>>> [模拟] 第一段语音结束，系统开始思考并回复...")
+                        set_state(PROCESSING)
+                        set_state(RESPONDING)
+                        print(f">>> [状态] 当前系统状态已切换为: {get_state().value} (等待打断)\n")
+                        simulated_responding = True
+
+                # --- 结果处理 ---
+                # 绝大多数块没有结果，直接进入下一块
+                if not results:
+                    continue
+                
+                # 本块产生的输出合并后一次写出
+                lines = []
+                for result in results:
+                    # result_type只读取一次，按类型分派
+                    result_type = result.result_type
+                    if result_type == "interruption":
+                        lines.append("\n🛑 [成功] 检测到打断事件!")
+                        lines.append(f"   时间戳: {result.interruption.timestamp_ms:.0f}ms")
+                        lines.append(f"   被打断的状态: {result.interruption.system_state.value}")
+                        interruption_triggered = True
+                        
+                        # 模拟：被打断后，业务逻辑应该停止回复，并准备聆听
+                        # 注意：Manager会自动切换到 COLLECTING，不需要我们手动切
+                        # 但业务层应该知道自己被打断了
+                        
+                    elif result_type == "segment":
+                        segment_count += 1
+                        seg = result.segment
+                        lines.append(f"🎤 [语音段 #{segment_count}] {seg.start_timestamp_ms:.0f}ms -> {seg.end_timestamp_ms:.0f}ms (时长: {seg.duration_ms:.0f}ms)")
+                        
+                        # 如果这是打断后的语音段，说明打断流程完整走通了
+                        if interruption_triggered and segment_count == 2:
+                            lines.append("   (这是打断系统回复后录制的语音)")
+                            # 语音结束，业务处理完成，回到IDLE
+                            set_state(IDLE)
+                
+                if lines:
+                    print("\n".join(lines))
+    finally:
+        # 处理器初始化失败等提前退出时，取消仍在进行的音频准备并取回其结果，
+        # 避免任务悬空（"Task exception was never retrieved"）
+        if not prepare_task.done():
+            prepare_task.cancel()
+        await asyncio.gather(prepare_task, return_exceptions=True)
+
+    # 输出缓存的日志（其他退出路径由logging在进程退出时刷新）
+    log_buffer.flush()
 
     print("\n=== 验证结果总结 ===")
     if interruption_triggered:
@@ -117,4 +262,10 @@ async def main():
         print("❌ 验证失败: 未触发打断事件 (可能是时间配合问题或逻辑问题)。")
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # 安装了uvloop时使用uvloop事件循环，降低逐块await的调度开销
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
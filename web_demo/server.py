@@ -65,7 +65,8 @@ class SessionManager:
 
         # 直接使用前端传入的config字典，Pydantic模型确保了字段的正确性
         # 创建配置对象
-        cascade_config = cascade.Config(**config.model_dump())
+        # 前端只展示语音段，空闲单帧只需计数
+        cascade_config = cascade.Config(**config.model_dump(), emit_idle_frames=False)
         processor = cascade.StreamProcessor(cascade_config)
         await processor.initialize()
         self.processors[client_id] = processor
@@ -118,6 +119,13 @@ class SessionManager:
 
                 if response_dict:
                     await websocket.send_json(response_dict)
+        except cascade.CascadeError as e:
+            # 同时处理的音频块超过MAX_INFLIGHT_CHUNKS时立即拒绝（不排队），该块被丢弃
+            if e.error_code == cascade.ErrorCode.RESOURCE_EXHAUSTED:
+                logger.warning(f"客户端 {client_id} 并发音频块过多，丢弃该块: {e}")
+            else:
+                logger.error(f"处理音频块失败 for {client_id}: {e}")
+            await websocket.send_json({"type": "error", "code": e.error_code.value, "message": str(e)})
         except Exception as e:
             logger.error(f"处理音频块失败 for {client_id}: {e}")
             await websocket.send_json({"type": "error", "message": str(e)})